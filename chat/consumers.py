@@ -1,62 +1,253 @@
-import json
+import asyncio
 import logging
-from asgiref.sync import sync_to_async
+import time
+import zlib
+from datetime import datetime, timezone as dt_timezone
+
+import orjson
+import redis.asyncio as aioredis
+from asgiref.sync import async_to_sync
 from channels.generic.websocket import AsyncWebsocketConsumer, AsyncJsonWebsocketConsumer
+from channels.layers import get_channel_layer
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import AnonymousUser
-from .models import ChatRoom, Message, Membership
+from .models import Message, Membership
+from .redis_pool import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Shared async Redis client for direct pub/sub fan-out in large rooms
+_pubsub_redis = None
+
+def get_pubsub_redis():
+    global _pubsub_redis
+    if _pubsub_redis is None:
+        _pubsub_redis = aioredis.Redis(**settings.REDIS_CONFIG)
+    return _pubsub_redis
+
+
+def notify_fanout_mode_change(room_id, use_pubsub):
+    """Tell every live connection in a room to switch fan-out transport.
+
+    Called from the membership views when the room crosses
+    LARGE_ROOM_FANOUT_THRESHOLD. Until each connection has switched,
+    some listen on the channel-layer group and some on the Redis
+    channel, so the control event goes out on both."""
+    event = {'type': 'fanout_changed', 'use_pubsub': use_pubsub}
+    async_to_sync(get_channel_layer().group_send)(f'chat_{room_id}', event)
+    redis_client.publish(f'room:{room_id}', orjson.dumps(event))
+
+
 class ChatConsumer(AsyncWebsocketConsumer):
+    # Bounds for the per-connection outbound queue and how many ready
+    # events get coalesced into a single websocket frame.
+    OUT_QUEUE_SIZE = 1000
+    SEND_BATCH_SIZE = 64
+
+    # Minimum gap between repeated typing broadcasts in the same state
+    TYPING_THROTTLE_SECONDS = 2.0
+
+    # Rooms with more members than this bypass the channel layer (which
+    # does one RPUSH per subscriber) in favour of a single Redis PUBLISH
+    # on a shared room channel that every consumer subscribes to.
+    LARGE_ROOM_FANOUT_THRESHOLD = 50
+
+    @staticmethod
+    def _iso(ts):
+        """Group payloads carry epoch floats (smaller channel-layer
+        frames); format to ISO only when building the client frame."""
+        if isinstance(ts, (int, float)):
+            return datetime.fromtimestamp(ts, tz=dt_timezone.utc).isoformat()
+        return ts
+
+    def _enqueue(self, payload):
+        """Queue an outbound event for the sender task instead of sending
+        a frame per event; full queue means the client can't keep up, so
+        the event is dropped rather than blocking the event loop."""
+        try:
+            self.out_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Outbound queue full, dropping event for %s", self.channel_name)
+
+    async def _broadcast(self, event):
+        """Fan an event out to the room: one PUBLISH on the shared room
+        channel for large rooms, group_send otherwise."""
+        if self._use_pubsub:
+            await get_pubsub_redis().publish(f'room:{self.room_id}', orjson.dumps(event))
+        else:
+            await self.channel_layer.group_send(self.room_group_name, event)
+
+    async def _pubsub_loop(self):
+        """Forward events from the room's Redis channel into the same
+        handlers the channel layer would dispatch to."""
+        async for frame in self._pubsub.listen():
+            if frame['type'] != 'message':
+                continue
+            try:
+                event = orjson.loads(frame['data'])
+                await getattr(self, event['type'])(event)
+            except Exception as e:
+                logger.error("Error in pubsub loop: %s", e)
+            if not self._use_pubsub:
+                # fanout_changed moved this connection back onto the
+                # channel layer and closed the pub/sub handle; stop
+                # before touching it again
+                break
+
+    async def _set_fanout(self, use_pubsub):
+        """Put this connection on the fan-out transport for the current
+        room size. The new path is joined before the old one is left, so
+        no events slip through the gap; each event travels exactly one
+        transport, so the brief overlap cannot duplicate frames."""
+        was = getattr(self, '_use_pubsub', None)
+        if use_pubsub == was:
+            return
+        if use_pubsub:
+            self._pubsub = get_pubsub_redis().pubsub()
+            await self._pubsub.subscribe(f'room:{self.room_id}')
+            self._pubsub_task = asyncio.create_task(self._pubsub_loop())
+            self._use_pubsub = True
+            if was is not None:
+                await self.channel_layer.group_discard(
+                    self.room_group_name,
+                    self.channel_name
+                )
+        else:
+            await self.channel_layer.group_add(
+                self.room_group_name,
+                self.channel_name
+            )
+            self._use_pubsub = False
+            if was:
+                # When the switch arrived over pub/sub this is running
+                # inside _pubsub_task itself; the loop checks
+                # _use_pubsub and exits on its own, so only another
+                # task gets cancelled here
+                if self._pubsub_task is not asyncio.current_task():
+                    self._pubsub_task.cancel()
+                await self._pubsub.unsubscribe(f'room:{self.room_id}')
+                await self._pubsub.aclose()
+
+    async def fanout_changed(self, event):
+        """Control event from notify_fanout_mode_change: the room
+        crossed the fan-out threshold while this connection was live."""
+        await self._set_fanout(event['use_pubsub'])
+
+    async def _sender(self):
+        """Drain the outbound queue, coalescing ready events into one
+        batch frame to amortize websocket framing overhead. Items that
+        are already bytes (pre-compressed broadcast frames) are shipped
+        as-is in their own binary frame."""
+        while True:
+            item = await self.out_queue.get()
+            if isinstance(item, (bytes, bytearray)):
+                await self.send(bytes_data=item)
+                continue
+            batch = [item]
+            pending_bytes = None
+            while not self.out_queue.empty() and len(batch) < self.SEND_BATCH_SIZE:
+                nxt = self.out_queue.get_nowait()
+                if isinstance(nxt, (bytes, bytearray)):
+                    pending_bytes = nxt
+                    break
+                batch.append(nxt)
+            await self.send(text_data=orjson.dumps({'type': 'batch', 'items': batch}).decode())
+            if pending_bytes is not None:
+                await self.send(bytes_data=pending_bytes)
+
+    # TTL on presence keys; refreshed on every status event so a dead
+    # connection ages out on its own
+    PRESENCE_TTL = 60
+
     async def update_user_status(self, status):
-        """Update user's status in the room"""
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        """Record presence in Redis and broadcast only transitions"""
+        # Presence is last-write-wins, so it lives in a SETEX key that
+        # clients can query; the room broadcast happens only when the
+        # status actually changes, not on every refresh
+        redis_conn = get_pubsub_redis()
+        previous = await redis_conn.getset(f'presence:{self._user_id}', status)
+        await redis_conn.expire(f'presence:{self._user_id}', self.PRESENCE_TTL)
+        if previous is not None and previous.decode() == status:
+            return
+
+        await self._broadcast(
             {
                 'type': 'user_status',
-                'user': self.user.username,
+                'user': self._username,
                 'status': status,
-                'timestamp': timezone.now().isoformat()
+                'timestamp': time.time()
             }
         )
 
     async def update_typing_status(self, is_typing):
-        """Send typing status to room group"""
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        """Send typing status to room group, dropping duplicate events"""
+        # Clients can emit typing events many times a second; state
+        # changes go out immediately but repeats of the current state
+        # are coalesced into one broadcast per throttle window
+        now = time.monotonic()
+        if (is_typing == self._last_typing_state
+                and now - self._last_typing_sent < self.TYPING_THROTTLE_SECONDS):
+            return
+        self._last_typing_state = is_typing
+        self._last_typing_sent = now
+
+        await self._broadcast(
             {
                 'type': 'typing_status',
-                'user': self.user.username,
+                'user': self._username,
                 'is_typing': is_typing,
-                'timestamp': timezone.now().isoformat()
+                'timestamp': time.time()
             }
         )
 
+    # How long read receipts are buffered before flushing as one batch
+    READ_FLUSH_DELAY = 0.1
+
+    async def _flush_reads(self):
+        """Debounced flush of buffered read receipts."""
+        await asyncio.sleep(self.READ_FLUSH_DELAY)
+        await self._do_flush_reads()
+
+    async def _do_flush_reads(self):
+        """One UPDATE and one bulk broadcast for every read receipt that
+        arrived inside the debounce window."""
+        ids = list(self._pending_reads)
+        if not ids:
+            return
+        self._pending_reads.clear()
+        await Message.objects.filter(id__in=ids).aupdate(status='seen')
+        await self._broadcast({
+            'type': 'message_status_bulk',
+            'ids': ids,
+            'status': 'seen',
+            'user': self._username,
+            'timestamp': time.time()
+        })
+
     async def update_message_status(self, message_id, status):
         """Update message status in database and broadcast to room"""
         try:
-            # Update message status in database
-            message = await sync_to_async(Message.objects.get)(id=message_id)
-            message.status = status
-            await sync_to_async(message.save)()
+            # Single-column UPDATE instead of fetching the row and
+            # rewriting every column through save()
+            updated = await Message.objects.filter(id=message_id).aupdate(status=status)
+            if not updated:
+                logger.error("Message %s not found", message_id)
+                return
 
             # Broadcast status update to room
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self._broadcast(
                 {
                     'type': 'message_status',
                     'message_id': message_id,
                     'status': status,
-                    'user': self.user.username,
-                    'timestamp': timezone.now().isoformat()
+                    'user': self._username,
+                    'timestamp': time.time()
                 }
             )
-            logger.info(f"Message {message_id} status updated to {status} by {self.user.username}")
-        except Message.DoesNotExist:
-            logger.error(f"Message {message_id} not found")
+            logger.debug("Message %s status updated to %s by %s", message_id, status, self._username)
         except Exception as e:
-            logger.error(f"Error updating message status: {str(e)}")
+            logger.error("Error updating message status: %s", e)
 
     async def connect(self):
         """Handle WebSocket connection"""
@@ -69,114 +260,173 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 logger.warning("Unauthenticated user tried to connect")
                 await self.close(code=4001)
                 return
+
+            # Cache identity once; handlers and broadcast dicts run in
+            # tight loops and should not chase model attributes
+            self._user_id = self.user.id
+            self._username = self.user.username
                 
             # Get room ID from the URL route
             self.room_id = self.scope['url_route']['kwargs']['room_id']
             
-            # Verify room exists and user is a member
-            try:
-                self.room = await sync_to_async(ChatRoom.objects.get)(id=self.room_id)
-                is_member = await sync_to_async(self.room.members.filter(id=self.user.id).exists)()
-                if not is_member:
-                    logger.warning(f"User {self.user.username} tried to join room {self.room_id} without membership")
-                    await self.close(code=4002)
-                    return
-            except ChatRoom.DoesNotExist:
-                logger.warning(f"Attempted to connect to non-existent room {self.room_id}")
-                await self.close(code=4004)
+            # Verify membership with a single indexed existence check;
+            # the ChatRoom row itself is never needed on this path, and a
+            # missing room simply has no memberships
+            is_member = await Membership.objects.filter(
+                room_id=self.room_id, user_id=self._user_id
+            ).aexists()
+            if not is_member:
+                logger.warning("User %s tried to join room %s without membership", self._username, self.room_id)
+                await self.close(code=4002)
                 return
                 
             self.room_group_name = f'chat_{self.room_id}'
             
-            logger.info(f"User {self.user.username} attempting to connect to room {self.room_id}")
-            
-            # Join room group
-            await self.channel_layer.group_add(
-                self.room_group_name,
-                self.channel_name
-            )
+            logger.debug("User %s attempting to connect to room %s", self._username, self.room_id)
+
+            # Large rooms subscribe straight to a shared Redis channel so
+            # each broadcast is one PUBLISH instead of one RPUSH per
+            # member; small rooms keep the channel layer. Direct chats
+            # always have two members, so the count alone decides. When
+            # the room later crosses the threshold, fanout_changed
+            # switches live connections rather than stranding them on
+            # the transport picked here.
+            member_count = await Membership.objects.filter(room_id=self.room_id).acount()
+            await self._set_fanout(member_count > self.LARGE_ROOM_FANOUT_THRESHOLD)
             
             # Accept the connection
             await self.accept()
-            
+
+            # All outbound traffic goes through one queue drained by a
+            # single background task per connection
+            self.out_queue = asyncio.Queue(maxsize=self.OUT_QUEUE_SIZE)
+            self._sender_task = asyncio.create_task(self._sender())
+
+            # Typing throttle state
+            self._last_typing_state = None
+            self._last_typing_sent = 0.0
+
+            # Read-receipt debounce state
+            self._pending_reads = set()
+            self._read_flush_task = None
+
             # Send last 50 messages
-            messages = await sync_to_async(list)(
-                Message.objects.filter(room=self.room)
+            messages = [
+                message async for message in
+                Message.objects.filter(room_id=self.room_id)
                 .order_by('-timestamp')[:50]
                 .select_related('sender')
-            )
+                # The replay frame only needs these columns; skip
+                # shipping attachment paths and the rest of the row
+                .only('id', 'content', 'status', 'timestamp',
+                      'sender_id', 'sender__username')
+            ]
             
+            # Messages from others still marked 'sent' become 'delivered'
+            # in one UPDATE instead of a get+save+broadcast per message
+            ids_to_mark = [
+                message.id for message in messages
+                if message.sender_id != self._user_id and message.status == 'sent'
+            ]
+
             for message in reversed(messages):
-                await self.send(text_data=json.dumps({
+                self._enqueue({
                     'type': 'chat.message',
                     'message_id': message.id,
                     'message': message.content,
                     'user': message.sender.username,
                     'message_type': 'message',
-                    'status': message.status,
+                    'status': 'delivered' if message.id in ids_to_mark else message.status,
                     'timestamp': message.timestamp.isoformat()
-                }))
-                # Mark messages as delivered for this user
-                if message.sender != self.user and message.status == 'sent':
-                    await self.update_message_status(message.id, 'delivered')
-            
+                })
+
+            if ids_to_mark:
+                # Predicates match the (room, status, timestamp) index;
+                # the id list keeps the update scoped to the replayed
+                # page and guards against concurrent status flips
+                await Message.objects.filter(
+                    room_id=self.room_id, status='sent', id__in=ids_to_mark
+                ).aupdate(status='delivered')
+                await self._broadcast(
+                    {
+                        'type': 'message_status_bulk',
+                        'ids': ids_to_mark,
+                        'status': 'delivered',
+                        'user': self._username,
+                        'timestamp': time.time()
+                    }
+                )
+
             # Send join message and update user status
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self._broadcast(
                 {
                     'type': 'chat_message',
-                    'message': f"{self.user.username} joined the chat",
-                    'user': self.user.username,
+                    'message': f"{self._username} joined the chat",
+                    'user': self._username,
                     'message_type': 'join',
-                    'timestamp': timezone.now().isoformat()
+                    'timestamp': time.time()
                 }
             )
             
             # Update user status to online
             await self.update_user_status('online')
             
-            logger.info(f"User {self.user.username} successfully connected to room {self.room_id}")
+            logger.debug("User %s successfully connected to room %s", self._username, self.room_id)
             
         except Exception as e:
-            logger.error(f"Error in connect: {str(e)}")
+            logger.error("Error in connect: %s", e)
             await self.close(code=4000)
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
         try:
+            if hasattr(self, '_sender_task'):
+                self._sender_task.cancel()
+
+            # Flush any read receipts still sitting in the debounce window
+            if getattr(self, '_read_flush_task', None) is not None:
+                self._read_flush_task.cancel()
+            if getattr(self, '_pending_reads', None):
+                await self._do_flush_reads()
+
             if hasattr(self, 'room_group_name') and hasattr(self, 'user'):
-                # Update user status to offline
+                # Update user status to offline and drop the presence key
                 await self.update_user_status('offline')
-                
+                await get_pubsub_redis().delete(f'presence:{self._user_id}')
+
                 # Clear typing status when user disconnects
                 await self.update_typing_status(False)
                 
                 # Send leave message to room group
-                await self.channel_layer.group_send(
-                    self.room_group_name,
+                await self._broadcast(
                     {
                         'type': 'chat_message',
-                        'message': f"{self.user.username} left the chat",
-                        'user': self.user.username,
+                        'message': f"{self._username} left the chat",
+                        'user': self._username,
                         'message_type': 'leave',
-                        'timestamp': timezone.now().isoformat()
+                        'timestamp': time.time()
                     }
                 )
                 
-                # Leave room group
-                await self.channel_layer.group_discard(
-                    self.room_group_name,
-                    self.channel_name
-                )
+                # Leave the fan-out path joined in connect()
+                if getattr(self, '_use_pubsub', False):
+                    self._pubsub_task.cancel()
+                    await self._pubsub.unsubscribe(f'room:{self.room_id}')
+                    await self._pubsub.aclose()
+                else:
+                    await self.channel_layer.group_discard(
+                        self.room_group_name,
+                        self.channel_name
+                    )
                 
-                logger.info(f"User {self.user.username} disconnected from room {self.room_id} with code: {close_code}")
+                logger.debug("User %s disconnected from room %s with code: %s", self._username, self.room_id, close_code)
         except Exception as e:
-            logger.error(f"Error in disconnect: {str(e)}")
+            logger.error("Error in disconnect: %s", e)
 
     async def receive(self, text_data):
         """Handle incoming WebSocket messages"""
         try:
-            text_data_json = json.loads(text_data)
+            text_data_json = orjson.loads(text_data)
             message_type = text_data_json.get('type', 'message')
             
             if message_type == 'status':
@@ -193,127 +443,170 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 return
 
             elif message_type == 'read_receipt':
-                # Handle read receipt
+                # Buffer read receipts briefly; catch-up scrolling emits
+                # one per visible message and they flush as a single
+                # UPDATE + one bulk broadcast
                 message_id = text_data_json.get('message_id')
                 if message_id:
-                    await self.update_message_status(message_id, 'seen')
+                    self._pending_reads.add(message_id)
+                    if self._read_flush_task is None or self._read_flush_task.done():
+                        self._read_flush_task = asyncio.create_task(self._flush_reads())
                 return
                 
             message_content = text_data_json.get('message', '')
-            logger.info(f"Received message from {self.user.username} in room {self.room_id}: {message_content}")
+            logger.debug("Received message from %s in room %s", self._username, self.room_id)
 
             # Clear typing status when message is sent
             await self.update_typing_status(False)
 
-            # Save message to database with initial status 'sending'
-            message = await sync_to_async(Message.objects.create)(
+            # Save message to database already marked 'sent' - the row
+            # only exists once it is being broadcast, so there is no
+            # window where 'sending' is observable
+            message = await Message.objects.acreate(
                 content=message_content,
-                sender=self.user,
-                room=self.room,
-                status='sending',
-                timestamp=timezone.now()
+                sender_id=self._user_id,
+                room_id=self.room_id,
+                status='sent'
             )
 
             # Send message to room group
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'chat_message',
-                    'message_id': message.id,
-                    'message': message_content,
-                    'user': self.user.username,
-                    'message_type': 'message',
-                    'status': 'sent',
-                    'timestamp': message.timestamp.isoformat()
-                }
-            )
+            event = {
+                'type': 'chat_message',
+                'message_id': message.id,
+                'message': message_content,
+                'user': self._username,
+                'message_type': 'message',
+                'status': 'sent',
+                'timestamp': message.timestamp.timestamp(),
+                # Sender gets a direct local echo below, so the fan-out
+                # copy addressed back to this channel is dropped
+                '_skip_sender_channel': self.channel_name
+            }
+            client_frame = dict(event, type='chat.message',
+                                timestamp=message.timestamp.isoformat())
+            del client_frame['_skip_sender_channel']
+            if not self._use_pubsub:
+                # Compress the client frame once here so the K receiving
+                # consumers ship cached bytes instead of each serializing
+                # and deflating the same payload (msgpack carries the
+                # bytes through the channel layer; the JSON pubsub path
+                # keeps the plain event)
+                event['_precompressed'] = zlib.compress(
+                    orjson.dumps(client_frame), 6)
 
-            # Update message status to 'sent'
-            await self.update_message_status(message.id, 'sent')
+            # Echo straight onto our own outbound queue instead of round-
+            # tripping the sender's copy through Redis
+            self._enqueue(client_frame)
+            await self._broadcast(event)
 
         except Exception as e:
-            logger.error(f"Error in receive: {str(e)}")
-            await self.send(text_data=json.dumps({
+            logger.error("Error in receive: %s", e)
+            self._enqueue({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
 
     # Handler methods for different message types
     async def chat_message(self, event):
         """Handle chat messages from the group"""
         try:
-            # Send message to WebSocket
-            await self.send(text_data=json.dumps({
-                'type': 'chat.message',
-                'message_id': event.get('message_id'),
-                'message': event['message'],
-                'user': event['user'],
-                'message_type': event['message_type'],
-                'status': event.get('status'),
-                'timestamp': event['timestamp']
-            }))
+            # Sender already echoed this message locally in receive()
+            if event.get('_skip_sender_channel') == self.channel_name:
+                return
+
+            # Queue message for the sender task; a pre-compressed frame
+            # is forwarded verbatim instead of re-serializing per client
+            if '_precompressed' in event:
+                self._enqueue(event['_precompressed'])
+            else:
+                self._enqueue({
+                    'type': 'chat.message',
+                    'message_id': event.get('message_id'),
+                    'message': event['message'],
+                    'user': event['user'],
+                    'message_type': event['message_type'],
+                    'status': event.get('status'),
+                    'timestamp': self._iso(event['timestamp'])
+                })
 
             # If this is a new message and recipient is not the sender, mark as delivered
             if (event['message_type'] == 'message' and 
-                event['user'] != self.user.username and 
+                event['user'] != self._username and 
                 event.get('status') == 'sent'):
                 await self.update_message_status(event['message_id'], 'delivered')
 
         except Exception as e:
-            logger.error(f"Error in chat_message: {str(e)}")
-            await self.send(text_data=json.dumps({
+            logger.error("Error in chat_message: %s", e)
+            self._enqueue({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
 
     async def user_status(self, event):
         """Handle user status updates from the group"""
         try:
-            await self.send(text_data=json.dumps({
+            self._enqueue({
                 'type': 'user.status',
                 'user': event['user'],
                 'status': event['status'],
-                'timestamp': event['timestamp']
-            }))
+                'timestamp': self._iso(event['timestamp'])
+            })
         except Exception as e:
-            logger.error(f"Error in user_status: {str(e)}")
-            await self.send(text_data=json.dumps({
+            logger.error("Error in user_status: %s", e)
+            self._enqueue({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
 
     async def typing_status(self, event):
         """Handle typing status updates from the group"""
         try:
-            await self.send(text_data=json.dumps({
+            self._enqueue({
                 'type': 'typing.status',
                 'user': event['user'],
                 'is_typing': event['is_typing'],
-                'timestamp': event['timestamp']
-            }))
+                'timestamp': self._iso(event['timestamp'])
+            })
         except Exception as e:
-            logger.error(f"Error in typing_status: {str(e)}")
-            await self.send(text_data=json.dumps({
+            logger.error("Error in typing_status: %s", e)
+            self._enqueue({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
 
     async def message_status(self, event):
         """Handle message status updates from the group"""
         try:
-            await self.send(text_data=json.dumps({
+            self._enqueue({
                 'type': 'message.status',
                 'message_id': event['message_id'],
                 'status': event['status'],
                 'user': event['user'],
-                'timestamp': event['timestamp']
-            }))
+                'timestamp': self._iso(event['timestamp'])
+            })
+        except Exception as e:
+            logger.error("Error in message_status: %s", e)
+            self._enqueue({
+                'type': 'error',
+                'message': str(e)
+            })
+
+    async def message_status_bulk(self, event):
+        """Handle bulk message status updates from the group"""
+        try:
+            self._enqueue({
+                'type': 'message.status.bulk',
+                'ids': event['ids'],
+                'status': event['status'],
+                'user': event['user'],
+                'timestamp': self._iso(event['timestamp'])
+            })
         except Exception as e:
-            logger.error(f"Error in message_status: {str(e)}")
-            await self.send(text_data=json.dumps({
+            logger.error("Error in message_status_bulk: %s", e)
+            self._enqueue({
                 'type': 'error',
                 'message': str(e)
-            }))
+            })
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
@@ -332,7 +625,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         )
 
         await self.accept()
-        logger.info(f"User {self.user.username} connected to NotificationConsumer")
+        logger.debug("User %s connected to NotificationConsumer", self.user.username)
 
     async def disconnect(self, close_code):
         if hasattr(self, 'group_name'):
@@ -340,7 +633,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
                 self.group_name,
                 self.channel_name
             )
-            logger.info(f"User {self.user.username} disconnected from NotificationConsumer")
+            logger.debug("User %s disconnected from NotificationConsumer", self.user.username)
 
     async def receive_json(self, content):
         # Optional: Handle client pings or request actions here
@@ -1,5 +1,8 @@
+import hashlib
 import json
+from types import SimpleNamespace
 from urllib.parse import parse_qs
+from cachetools import TTLCache
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.tokens import AccessToken
@@ -8,19 +11,43 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Reconnect storms replay the same tokens within seconds; caching the
+# resolved identity skips both the signature check and the user query.
+# The short TTL bounds how long a revoked/deactivated user can still
+# handshake. Keys are hashed so raw tokens never sit in memory.
+_identity_cache = TTLCache(maxsize=10000, ttl=30)
+
+def _cache_key(token_key):
+    return hashlib.sha256(token_key.encode()).digest()[:16]
+
 @database_sync_to_async
-def get_user_from_token(token_key):
+def get_identity_from_token(token_key):
     """
-    Validate JWT token and return user
+    Validate JWT token and return a (user_id, username) pair, or None.
+
+    Only the identity is returned — a full User instance pinned to the
+    scope would sit in memory for the lifetime of the connection, which
+    for websockets is hours. Consumers that need the real row fetch it
+    by scope['user_id'].
     """
     if not token_key:
-        return AnonymousUser()
-    
+        return None
+
+    key = _cache_key(token_key)
+    identity = _identity_cache.get(key)
+    if identity is not None:
+        return identity
+
     try:
         access_token = AccessToken(token_key)
-        return User.objects.get(id=access_token['user_id'])
-    except (InvalidToken, TokenError, User.DoesNotExist):
-        return AnonymousUser()
+        identity = User.objects.filter(
+            id=access_token['user_id'], is_active=True
+        ).values_list('id', 'username').first()
+    except (InvalidToken, TokenError):
+        return None
+    if identity is not None:
+        _identity_cache[key] = identity
+    return identity
 
 class JWTAuthMiddleware:
     """
@@ -30,27 +57,55 @@ class JWTAuthMiddleware:
         self.app = app
 
     async def __call__(self, scope, receive, send):
-        # Get token from query string or headers
-        token_key = None
-        
-        # Check query string first
-        query_string = parse_qs(scope.get('query_string', b'').decode())
-        if 'token' in query_string:
-            token_key = query_string['token'][0]
-        
-        # Fallback to authorization header
-        if not token_key and 'headers' in scope:
-            headers = dict(scope['headers'])
-            if b'authorization' in headers:
-                auth_header = headers[b'authorization'].decode()
-                if auth_header.startswith('Bearer '):
-                    token_key = auth_header.split(' ')[1]
-        
-        # Authenticate user
-        scope['user'] = await get_user_from_token(token_key)
-        
+        # Only websocket handshakes carry a token to resolve
+        if scope['type'] != 'websocket':
+            return await self.app(scope, receive, send)
+
+        # The guard covers authentication only: a failure there means
+        # an anonymous connection, while exceptions from the downstream
+        # app propagate untouched (and the app is never invoked twice).
+        try:
+            identity = await self._authenticate(scope)
+        except Exception:
+            identity = None
+
+        # scope['user'] is a lightweight stand-in carrying just
+        # id/username so nothing heavy lives as long as the connection
+        # does.
+        if identity is None:
+            scope['user'] = AnonymousUser()
+        else:
+            user_id, username = identity
+            scope['user_id'] = user_id
+            scope['username'] = username
+            scope['user'] = SimpleNamespace(
+                id=user_id, username=username, is_authenticated=True
+            )
+
         return await self.app(scope, receive, send)
 
+    async def _authenticate(self, scope):
+        """Extract the token from the scope and resolve its identity."""
+        # The Authorization header is checked as raw bytes first so the
+        # common case never decodes or parses the query string at all.
+        token_key = None
+
+        headers = dict(scope.get('headers') or ())
+        auth_header = headers.get(b'authorization')
+        if auth_header and auth_header[:7] == b'Bearer ':
+            token_key = auth_header[7:].decode('ascii', 'ignore')
+
+        # Fallback to the query string, parsed lazily and only when it
+        # can actually contain a token
+        if not token_key:
+            query_string = scope.get('query_string', b'')
+            if b'token=' in query_string:
+                params = parse_qs(query_string.decode())
+                if 'token' in params:
+                    token_key = params['token'][0]
+
+        return await get_identity_from_token(token_key)
+
 def JWTAuthMiddlewareStack(inner):
     """
     Helper to return properly configured middleware stack
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-08-31 13:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['room', 'status', 'timestamp'], name='msg_room_status_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-08-31 14:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0006_alter_membership_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['room', 'user', 'role'], name='mem_room_user_role_idx'),
+        ),
+    ]
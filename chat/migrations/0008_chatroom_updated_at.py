@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-08-31 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0007_membership_mem_room_user_role_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from django.db.models import Q
+from django.db.models.functions import Now
 from users.models import User
 
 
@@ -13,6 +14,9 @@ class ChatRoom(models.Model):
     name = models.CharField(max_length=255, null=True, blank=True)
     type = models.CharField(max_length=10, choices=TYPE_CHOICES, default='direct')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Room version: cache keys embed this so serialized payloads
+    # invalidate whenever the row changes
+    updated_at = models.DateTimeField(auto_now=True)
     members = models.ManyToManyField(User, through='Membership', related_name='chat_rooms')
 
     class Meta:
@@ -55,7 +59,18 @@ class Membership(models.Model):
     last_role_change = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        unique_together = ('user', 'room')
+        constraints = [
+            # DB-level idempotency for membership adds; get_or_create
+            # callers rely on this under concurrency
+            models.UniqueConstraint(fields=['user', 'room'], name='uniq_membership'),
+        ]
+        indexes = [
+            # Backs the per-room admin checks in the membership actions
+            models.Index(fields=['room', 'role'], name='mem_room_role_idx'),
+            # Covers the "is this user an admin of this room" exists()
+            # checks so they resolve as index-only scans
+            models.Index(fields=['room', 'user', 'role'], name='mem_room_user_role_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if self.pk:
@@ -75,7 +90,9 @@ class Message(models.Model):
     content = models.TextField()
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='messages')
-    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    # Timestamped by the database itself; no Python-side datetime
+    # construction on the hot send path
+    timestamp = models.DateTimeField(db_default=Now(), db_index=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='sending')
     deleted_at = models.DateTimeField(null=True, blank=True)
     read_by = models.ManyToManyField(User, related_name='read_messages', blank=True)
@@ -86,6 +103,11 @@ class Message(models.Model):
         indexes = [
             models.Index(fields=['room', 'timestamp']),
             models.Index(fields=['status']),
+            models.Index(fields=['room', 'status', 'timestamp'], name='msg_room_status_ts_idx'),
+            # Matches the list/replay access pattern: filter by room,
+            # newest first, with id breaking timestamp ties for the
+            # cursor pagination
+            models.Index(fields=['room', '-timestamp', '-id'], name='msg_room_ts_idx'),
         ]
         ordering = ['timestamp']
 
@@ -0,0 +1,14 @@
+import redis
+from django.conf import settings
+
+# One explicitly-sized pool per process, shared by every request.
+# BlockingConnectionPool makes callers wait for a free connection
+# instead of erroring out or opening unbounded sockets under load.
+POOL = redis.BlockingConnectionPool(
+    max_connections=settings.REDIS_POOL_SIZE,
+    socket_keepalive=True,
+    health_check_interval=30,
+    **settings.REDIS_CONFIG,
+)
+
+redis_client = redis.Redis(connection_pool=POOL)
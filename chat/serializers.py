@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import ChatRoom, Message, Membership
 from users.serializers import UserSerializer
@@ -5,20 +6,38 @@ from users.models import User
 
 class ChatRoomSerializer(serializers.ModelSerializer):
     members = serializers.SerializerMethodField()
+    member_count = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
-    unread_count = serializers.SerializerMethodField()
+    # Filled by the views' _annotate_unread annotation; counting here
+    # would reintroduce one COUNT query per room
+    unread_count = serializers.IntegerField(read_only=True)
     my_membership = serializers.SerializerMethodField()
 
     class Meta:
         model = ChatRoom
         fields = [
-            'id', 'name', 'type', 'members', 'created_at',
+            'id', 'name', 'type', 'members', 'member_count', 'created_at',
             'last_message', 'unread_count', 'my_membership'
         ]
         read_only_fields = ['created_at']
 
+    def get_member_count(self, obj: ChatRoom):
+        count = getattr(obj, 'member_count', None)
+        if count is not None:
+            return count
+        memberships = getattr(obj, '_prefetched_objects_cache', {}).get('memberships')
+        return len(memberships) if memberships is not None else obj.memberships.count()
+
     def get_members(self, obj: ChatRoom):
-        memberships = obj.memberships.select_related('user').all()
+        # The list view only prefetches memberships for ?expand=members;
+        # without the cache the member list is omitted and clients use
+        # member_count instead
+        if 'memberships' not in getattr(obj, '_prefetched_objects_cache', {}):
+            return None
+        # The views prefetch memberships with their users; chaining
+        # select_related here would build a fresh queryset and bypass
+        # that cache
+        memberships = obj.memberships.all()
         return [
             {
                 'id': m.user.id,
@@ -35,7 +54,11 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         if not user or not user.is_authenticated:
             return None
         
-        membership = obj.memberships.filter(user=user).first()
+        if hasattr(obj, 'my_memberships'):
+            # Prefetched by the views; filtering here would query per room
+            membership = obj.my_memberships[0] if obj.my_memberships else None
+        else:
+            membership = obj.memberships.filter(user=user).first()
         if membership:
             return {
                 'role': membership.role,
@@ -45,7 +68,20 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         return None
 
     def get_last_message(self, obj):
-        last_message = Message.objects.filter(room=obj).order_by('-timestamp').first()
+        if hasattr(obj, 'last_message_id'):
+            # Annotated by the views' _annotate_last_message; no query
+            if obj.last_message_id is None:
+                return None
+            return {
+                'id': obj.last_message_id,
+                'text': obj.last_message_content,
+                'timestamp': obj.last_message_timestamp,
+                'sender': obj.last_message_sender
+            }
+        last_message = (
+            Message.objects.filter(room=obj)
+            .select_related('sender').order_by('-timestamp').first()
+        )
         if last_message:
             return {
                 'id': last_message.id,
@@ -55,13 +91,6 @@ class ChatRoomSerializer(serializers.ModelSerializer):
             }
         return None
 
-    def get_unread_count(self, obj: ChatRoom):
-        request = self.context.get('request')
-        user = getattr(request, 'user', None)
-        if not user or not user.is_authenticated:
-            return 0
-        return obj.messages.exclude(sender=user).exclude(read_by=user).count()
-
 class ChatRoomCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChatRoom
@@ -94,14 +123,16 @@ class ChatRoomCreateSerializer(serializers.ModelSerializer):
         if not members_data or user.id in members_data:
             raise serializers.ValidationError("You must add at least one other user.")
 
-        chat_room = ChatRoom.objects.create(**validated_data)
-
-        # Add creator as admin
-        Membership.objects.create(user=user, room=chat_room, role='admin')
+        with transaction.atomic():
+            chat_room = ChatRoom.objects.create(**validated_data)
 
-        # Add others
-        for user_id in members_data:
-            Membership.objects.create(user_id=user_id, room=chat_room, role='member')
+            # Creator as admin plus the other members, in one INSERT
+            Membership.objects.bulk_create(
+                [Membership(user=user, room=chat_room, role='admin')] +
+                [Membership(user_id=user_id, room=chat_room, role='member')
+                 for user_id in members_data],
+                ignore_conflicts=True
+            )
 
         return chat_room
 
@@ -122,8 +153,13 @@ class MessageSerializer(serializers.ModelSerializer):
     def get_attachment_url(self, obj: Message):
         if not obj.attachment:
             return None
-        request = self.context.get('request')
         url = obj.attachment.url
+        # The message list view caches the scheme+host prefix per request
+        # so this is plain concatenation instead of a URL reassembly
+        abs_prefix = self.context.get('abs_prefix')
+        if abs_prefix:
+            return abs_prefix + url
+        request = self.context.get('request')
         return request.build_absolute_uri(url) if request else url
 
     def get_is_deleted(self, obj: Message):
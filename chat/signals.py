@@ -1,23 +1,36 @@
+import asyncio
+import logging
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
-from .models import Message
+from .models import Message, Membership
+from users.models import User
+
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=Message)
 def send_message_notification(sender, instance, created, **kwargs):
     if created:
         channel_layer = get_channel_layer()
-        room_id = instance.room.id
-        
-        # Log for debugging
-        print(f"Message created: {instance.id} in room {room_id} by {instance.sender.username}")
-        
+        # The FK ids are already on the instance; touching instance.room
+        # or instance.sender would each cost a SELECT
+        room_id = instance.room_id
+
+        logger.debug("Message created: %s in room %s by user %s", instance.id, room_id, instance.sender_id)
+
+        # One single-column fetch for the username, shared by both payloads
+        sender_username = (
+            User.objects.filter(pk=instance.sender_id)
+            .values_list('username', flat=True).first()
+        )
+
         data = {
             'type': 'new_message',
             'message': {
                 'id': instance.id,
-                'sender': instance.sender.username,
+                'sender': sender_username,
                 'content': instance.content,
                 'timestamp': instance.timestamp.isoformat(),
                 'status': instance.status,
@@ -27,24 +40,48 @@ def send_message_notification(sender, instance, created, **kwargs):
             f"chatroom_{room_id}",
             data
         )
-        
+
         # Send notifications to other users in the room
-        send_notification_to_users(instance.room, instance)
+        send_notification_to_users(room_id, instance, sender_username)
 
-def send_notification_to_users(room, message):
-    members = room.members.exclude(id=message.sender.id)
+        # New message changes last_message/unread_count for everyone in
+        # the room; drop their cached room lists (imported lazily to
+        # avoid a signals <-> views import cycle)
+        from .views import invalidate_room_list_cache
+        invalidate_room_list_cache(
+            Membership.objects.filter(room_id=room_id).values_list('user_id', flat=True)
+        )
+
+def send_notification_to_users(room_id, message, sender_username):
+    # Only the ids are needed for group names; skip hydrating User rows.
+    # Materialized here: the queryset must run before entering the
+    # event loop, where ORM access raises SynchronousOnlyOperation.
+    member_ids = list(
+        Membership.objects.filter(room_id=room_id).exclude(
+            user_id=message.sender_id
+        ).values_list('user_id', flat=True)
+    )
     channel_layer = get_channel_layer()
 
-    for member in members:
-        async_to_sync(channel_layer.group_send)(
-            f"notifications_{member.id}",  # Match the group name in NotificationConsumer
-            {
-                "type": "send_notification",  # Match the handler method in NotificationConsumer
-                "event": "new_message",
-                "room_id": room.id,
-                "message_id": message.id,
-                "message": message.content,
-                "sender": message.sender.username,
-                "timestamp": str(message.timestamp),
-            },
-        )
+    payload = {
+        "type": "send_notification",  # Match the handler method in NotificationConsumer
+        "event": "new_message",
+        "room_id": room_id,
+        "message_id": message.id,
+        "message": message.content,
+        "sender": sender_username,
+        "timestamp": str(message.timestamp),
+    }
+
+    # One event-loop hop for the whole room: the per-member publishes
+    # run concurrently instead of one blocking roundtrip each. The
+    # group names are built up front so the coroutine does channel-layer
+    # I/O only — nothing inside it may touch the ORM.
+    groups = [f"notifications_{member_id}" for member_id in member_ids]
+
+    async def _fanout():
+        await asyncio.gather(*[
+            channel_layer.group_send(group, payload) for group in groups
+        ])
+
+    async_to_sync(_fanout)()
@@ -1,14 +1,20 @@
-import pickle
 from functools import wraps
 
-from django.db import transaction
-from django.db.models import Q, Count, Prefetch
+import hashlib
+import orjson
+import zstandard
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.db.models import Q, Count, IntegerField, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce, Now
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, CharFilter
 
 from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.permissions import IsAuthenticated
@@ -18,9 +24,9 @@ from rest_framework.throttling import ScopedRateThrottle
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
-import redis
-
+from .consumers import ChatConsumer, notify_fanout_mode_change
 from .models import ChatRoom, Message, Membership
+from .redis_pool import redis_client
 from .serializers import (
     ChatRoomSerializer,
     ChatRoomCreateSerializer,
@@ -33,9 +39,170 @@ from .permissions import IsMessageOwner
 from users.models import User
 from users.serializers import UserSerializer
 
-# Redis
-redis_client = redis.Redis(host='localhost', port=6379, db=0)
 OTP_EXPIRY_TIME = 300
+ROOM_LIST_CACHE_TTL = 30
+
+# Cached payloads are JSON-native DRF data, so orjson + zstd beats
+# pickle on speed and size and never executes code on load
+_zstd_compress = zstandard.ZstdCompressor(level=3)
+_zstd_decompress = zstandard.ZstdDecompressor()
+
+
+def _cache_dumps(data):
+    return _zstd_compress.compress(orjson.dumps(data, default=str))
+
+
+def _cache_loads(blob):
+    return orjson.loads(_zstd_decompress.decompress(blob))
+
+
+def invalidate_room_list_cache(user_ids):
+    """Drop the cached room list for the given users; called whenever a
+    message lands or a room's membership changes."""
+    keys = [f'rooms:{uid}' for uid in user_ids]
+    if keys:
+        redis_client.delete(*keys)
+
+
+def _members_prefetch():
+    """Membership prefetch shared by the room list and detail views, so
+    ChatRoomSerializer.get_members walks a cached list instead of firing
+    one query per room. Only the columns the serializer reads are
+    selected."""
+    return Prefetch(
+        'memberships',
+        queryset=Membership.objects.select_related('user').only(
+            'id', 'role', 'joined_at', 'room_id', 'user__id', 'user__username'
+        )
+    )
+
+
+def _my_membership_prefetch(user):
+    """The requesting user's own membership row per room, cached under
+    my_memberships so get_my_membership avoids a per-room filter query."""
+    return Prefetch(
+        'memberships',
+        queryset=Membership.objects.filter(user=user).only(
+            'id', 'role', 'joined_at', 'room_id', 'user_id'
+        ),
+        to_attr='my_memberships'
+    )
+
+
+def _annotate_last_message(queryset):
+    """Pull each room's newest message fields into the room SELECT with
+    correlated subqueries, so last_message costs no query of its own."""
+    latest = Message.objects.filter(room=OuterRef('pk')).order_by('-timestamp')
+    return queryset.annotate(
+        last_message_id=Subquery(latest.values('id')[:1]),
+        last_message_content=Subquery(latest.values('content')[:1]),
+        last_message_timestamp=Subquery(latest.values('timestamp')[:1]),
+        last_message_sender=Subquery(latest.values('sender__username')[:1]),
+    )
+
+
+def _annotate_unread(queryset, user):
+    """Attach the per-room unread count in the same SELECT; the
+    serializer exposes it as a plain integer field. A correlated
+    subquery avoids the filtered-Count form, whose NOT semantics
+    left-join Message plus the read_by M2M onto every room row."""
+    unread = (
+        Message.objects.filter(room=OuterRef('pk'))
+        .exclude(sender=user)
+        .exclude(read_by=user)
+        .order_by()
+        .values('room')
+        .annotate(c=Count('*'))
+        .values('c')
+    )
+    return queryset.annotate(
+        unread_count=Coalesce(
+            Subquery(unread, output_field=IntegerField()), 0
+        )
+    )
+
+
+DIRECT_CHAT_CACHE_TTL = 86400
+
+
+def _direct_chat_cache_key(uid_a, uid_b):
+    lo, hi = sorted((uid_a, uid_b))
+    return f'directchat:{lo}:{hi}'
+
+
+def _find_direct_chat(user_a, user_b):
+    """The direct room whose member set is exactly the given pair, found
+    with one aggregated query instead of chained M2M joins that scan
+    every direct room either user belongs to. Resolved ids are kept in
+    Redis under the sorted pair so repeat opens skip the query."""
+    cache_key = _direct_chat_cache_key(user_a.id, user_b.id)
+    cached_id = redis_client.get(cache_key)
+    if cached_id:
+        room = ChatRoom.objects.filter(id=int(cached_id), type='direct').first()
+        if room is not None:
+            return room
+
+    room = ChatRoom.objects.filter(
+        type='direct', memberships__user__in=[user_a, user_b]
+    ).annotate(
+        pair_count=Count(
+            'memberships',
+            filter=Q(memberships__user__in=[user_a, user_b]),
+            distinct=True
+        ),
+        member_count=Count('memberships', distinct=True)
+    ).filter(pair_count=2, member_count=2).first()
+    if room is not None:
+        redis_client.setex(cache_key, DIRECT_CHAT_CACHE_TTL, str(room.id))
+    return room
+
+
+def _room_for_response(room_id, user):
+    """Re-fetch a room through the annotated, prefetched queryset so a
+    just-created or looked-up room serializes identically to the list."""
+    return _annotate_unread(
+        _annotate_last_message(
+            ChatRoom.objects.prefetch_related(
+                _members_prefetch(), _my_membership_prefetch(user)
+            )
+        ),
+        user
+    ).get(pk=room_id)
+
+
+def serialize_room_cached(room, user, context):
+    """ChatRoomSerializer output for one room, cached per (room,
+    version, user). The updated_at component rolls the key whenever the
+    room row changes; the short TTL bounds staleness from activity that
+    doesn't touch it (new messages, membership rows).
+
+    The key needs only id and updated_at, so any ChatRoom row works —
+    the annotated, prefetched re-fetch the serializer needs happens only
+    on a miss; a hit costs one Redis roundtrip."""
+    cache_key = f'room:{room.id}:{room.updated_at.timestamp()}:{user.id}'
+    cached = redis_client.get(cache_key)
+    if cached:
+        return orjson.loads(cached)
+    data = ChatRoomSerializer(
+        _room_for_response(room.id, user), context=context
+    ).data
+    blob = orjson.dumps(data, default=str)
+    redis_client.setex(cache_key, ROOM_LIST_CACHE_TTL, blob)
+    # Decode the cached form so hits and misses render identically
+    # (orjson and DRF format datetimes differently)
+    return orjson.loads(blob)
+
+
+def _locked_room_memberships(room_id):
+    """The room's membership rows under row locks. of=('self',) keeps
+    the lock off joined tables on Postgres; SQLite (dev) doesn't
+    support the clause."""
+    queryset = Membership.objects.all()
+    if connection.features.has_select_for_update_of:
+        queryset = queryset.select_for_update(of=('self',))
+    else:
+        queryset = queryset.select_for_update()
+    return list(queryset.filter(room_id=room_id))
 
 
 class ChatRoomPagination(PageNumberPagination):
@@ -63,17 +230,57 @@ class ChatRoomListCreateView(generics.ListCreateAPIView):
         return ChatRoomCreateSerializer if self.request.method == 'POST' else ChatRoomSerializer
 
     def get_queryset(self):
-        return ChatRoom.objects.filter(
+        queryset = ChatRoom.objects.filter(
             members=self.request.user
-        ).prefetch_related(
-            Prefetch('memberships', queryset=Membership.objects.select_related('user')),
-            Prefetch('messages', queryset=Message.objects.order_by('-timestamp')[:1], to_attr='prefetched_last_message')
-        ).annotate(
-            unread_count=Count(
-                'messages',
-                filter=~Q(messages__read_by=self.request.user) & ~Q(messages__sender=self.request.user)
+        ).only(
+            # Everything else the payload needs comes from annotations
+            # and prefetches
+            'id', 'name', 'type', 'created_at'
+        ).prefetch_related(_my_membership_prefetch(self.request.user))
+        # The full member list is opt-in: without ?expand=members the
+        # list serves a member_count annotation and skips the prefetch
+        # round-trip plus N x avg_members rows entirely. A correlated
+        # subquery counts all memberships; Count('memberships') would
+        # reuse the join already filtered to the requesting user and
+        # report 1 for every room.
+        if self.request.query_params.get('expand') == 'members':
+            queryset = queryset.prefetch_related(_members_prefetch())
+        else:
+            members = (
+                Membership.objects.filter(room=OuterRef('pk'))
+                .order_by()
+                .values('room')
+                .annotate(c=Count('*'))
+                .values('c')
+            )
+            queryset = queryset.annotate(
+                member_count=Coalesce(
+                    Subquery(members, output_field=IntegerField()), 0
+                )
             )
-        ).order_by('-memberships__joined_at')
+        queryset = _annotate_last_message(queryset)
+        return _annotate_unread(queryset, self.request.user).order_by('-memberships__joined_at')
+
+    def list(self, request, *args, **kwargs):
+        # Room lists are polled aggressively; serve the rendered payload
+        # from Redis for a short window. Filtered/paginated variants go
+        # through the normal path so the cache holds one entry per user.
+        cacheable = not request.query_params
+        cache_key = f'rooms:{request.user.id}'
+        if cacheable:
+            cached = redis_client.get(cache_key)
+            if cached:
+                return Response(_cache_loads(cached))
+
+        response = super().list(request, *args, **kwargs)
+        if cacheable and response.status_code == 200:
+            blob = _cache_dumps(response.data)
+            redis_client.setex(cache_key, ROOM_LIST_CACHE_TTL, blob)
+            # Serve the decoded cached form so the first (miss) response
+            # matches later hits byte for byte — orjson and DRF differ
+            # in datetime formatting
+            response = Response(_cache_loads(blob))
+        return response
 
     @swagger_auto_schema(
         operation_description="Create a new chat room",
@@ -83,7 +290,12 @@ class ChatRoomListCreateView(generics.ListCreateAPIView):
     def create(self, request, *args, **kwargs):
         if request.data.get('type') == 'direct':
             return self._create_direct_chat(request)
-        return super().create(request, *args, **kwargs)
+        response = super().create(request, *args, **kwargs)
+        if response.status_code == 201:
+            invalidate_room_list_cache(
+                list(request.data.get('members', [])) + [request.user.id]
+            )
+        return response
 
     def _create_direct_chat(self, request):
         other_user_id = request.data.get('members', [])
@@ -95,12 +307,15 @@ class ChatRoomListCreateView(generics.ListCreateAPIView):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=404)
 
-        existing_chat = ChatRoom.objects.filter(
-            type='direct', members=request.user
-        ).filter(members=other_user).first()
+        existing_chat = _find_direct_chat(request.user, other_user)
 
         if existing_chat:
-            return Response(ChatRoomSerializer(existing_chat, context={'request': request}).data, status=200)
+            return Response(
+                serialize_room_cached(
+                    existing_chat, request.user, {'request': request}
+                ),
+                status=200
+            )
 
         with transaction.atomic():
             chat = ChatRoom.objects.create(type='direct')
@@ -108,8 +323,19 @@ class ChatRoomListCreateView(generics.ListCreateAPIView):
                 Membership(user=request.user, room=chat, role='admin'),
                 Membership(user=other_user, room=chat, role='admin')
             ])
+        redis_client.setex(
+            _direct_chat_cache_key(request.user.id, other_user.id),
+            DIRECT_CHAT_CACHE_TTL, str(chat.id)
+        )
+        invalidate_room_list_cache([request.user.id, other_user.id])
 
-        return Response(ChatRoomSerializer(chat, context={'request': request}).data, status=201)
+        # Through the same cache round-trip as the existing-chat path, so
+        # the 201 body matches the 200s later polls get byte for byte
+        # (and the payload cache is primed)
+        return Response(
+            serialize_room_cached(chat, request.user, {'request': request}),
+            status=201
+        )
 
 
 class ChatRoomDetailView(generics.RetrieveAPIView):
@@ -117,23 +343,50 @@ class ChatRoomDetailView(generics.RetrieveAPIView):
     serializer_class = ChatRoomSerializer
 
     def get_queryset(self):
+        # Membership scoping only — serialize_room_cached does the
+        # annotated re-fetch on a cache miss
         return ChatRoom.objects.filter(members=self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        # Serve the cached form so the detail payload renders exactly
+        # like the same room in the cached list
+        return Response(
+            serialize_room_cached(
+                self.get_object(), request.user, self.get_serializer_context()
+            )
+        )
+
+
+def _messages_cache_key(room_id, user_id, cursor=None):
+    if cursor:
+        return f'messages:{room_id}:{user_id}:{cursor}'
+    return f'messages:{room_id}:{user_id}'
+
 
 def cache_messages(timeout=300):
     def decorator(view_func):
         @wraps(view_func)
         def wrapped_view(self, request, *args, **kwargs):
-            cache_key = f'messages:{kwargs.get("room_id")}:{request.user.id}'
-            cached_data = redis_client.get(cache_key)
+            cache_key = _messages_cache_key(
+                kwargs.get('room_id'), request.user.id,
+                request.query_params.get('before')
+            )
+            # Value and remaining TTL come back in one roundtrip; the
+            # TTL lets hit-path callers decide whether a refresh is due
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(cache_key)
+            pipe.ttl(cache_key)
+            cached_data, ttl = pipe.execute()
 
             if cached_data:
-                return Response(pickle.loads(cached_data))
+                response = Response(_cache_loads(cached_data))
+                response['X-Cache-TTL'] = str(ttl)
+                return response
 
             response = view_func(self, request, *args, **kwargs)
 
             if response.status_code == 200:
-                redis_client.setex(cache_key, timeout, pickle.dumps(response.data))
+                redis_client.setex(cache_key, timeout, _cache_dumps(response.data))
 
             return response
         return wrapped_view
@@ -142,7 +395,9 @@ def cache_messages(timeout=300):
 
 class MessageCursorPagination(CursorPagination):
     page_size = 50
-    ordering = '-timestamp'
+    # The id tiebreaker keeps cursor boundaries stable when several
+    # messages share a timestamp; matches msg_room_ts_idx
+    ordering = ('-timestamp', '-id')
     cursor_query_param = 'before'
 
 
@@ -154,27 +409,133 @@ class MessageListView(generics.ListCreateAPIView):
     throttle_scope = 'message_create'
 
     def get_queryset(self):
+        # No select_related('room'): nothing reads the room row, the
+        # membership filter only joins for the WHERE clause. The sender
+        # join is trimmed to the columns the payload uses.
         return Message.objects.filter(
             room_id=self.kwargs['room_id'],
             room__members=self.request.user,
             deleted_at__isnull=True
-        ).select_related('sender', 'room').order_by('-timestamp')
+        ).select_related('sender').only(
+            'id', 'room_id', 'content', 'timestamp', 'status',
+            'attachment', 'attachment_type', 'deleted_at',
+            'sender__id', 'sender__username'
+        ).order_by('-timestamp', '-id')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Build the scheme+host prefix once; get_attachment_url would
+        # otherwise call build_absolute_uri per message
+        context['abs_prefix'] = self.request.build_absolute_uri('/').rstrip('/')
+        return context
 
     def perform_create(self, serializer):
-        room = get_object_or_404(ChatRoom.objects.filter(members=self.request.user), pk=self.kwargs['room_id'])
+        # The room id is already known, so the membership check only has
+        # to confirm the row exists; only('id') keeps it an index lookup
+        room = ChatRoom.objects.filter(
+            id=self.kwargs['room_id'], members=self.request.user
+        ).only('id').first()
+        if room is None:
+            raise NotFound("Chat room not found")
         message = serializer.save(sender=self.request.user, room=room, status='delivered')
-        self._notify_new_message(message)
+        # Runs after the INSERT commits, so the fan-out can never
+        # observe (or block on) an uncommitted message
+        transaction.on_commit(lambda: self._notify_new_message(message))
 
     def _notify_new_message(self, message):
         pass  # Placeholder for real-time
 
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        if response.data:
-            Message.objects.filter(
-                room_id=self.kwargs['room_id'],
-                read_by=self.request.user
-            ).exclude(read_by=self.request.user).update(status='seen')
+        # The ETag versions the room so polling clients whose view
+        # hasn't changed get a 304 before any pagination or
+        # serialization work happens. Newest timestamp alone isn't
+        # enough: soft-deletes flip deleted_at, edits bump the room's
+        # updated_at (see MessageDetailView), and the count catches
+        # hard deletes — all folded in from the same single aggregate.
+        # Scoped by membership so non-members never see a live ETag.
+        stats = Message.objects.filter(
+            room_id=self.kwargs['room_id'],
+            room__members=request.user
+        ).aggregate(
+            newest=Max('timestamp'),
+            last_deleted=Max('deleted_at'),
+            total=Count('id'),
+            room_version=Max('room__updated_at'),
+        )
+        etag = hashlib.md5(
+            "{}:{}:{newest}:{last_deleted}:{total}:{room_version}".format(
+                self.kwargs['room_id'], request.user.id, **stats
+            ).encode()
+        ).hexdigest()
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            return HttpResponseNotModified()
+
+        # Fast path: the list payload is flat, so rows come straight from
+        # a .values() queryset and get dumped with orjson instead of
+        # going through DRF's per-field serialization. The sender is a
+        # plain {id, username} dict here rather than the full
+        # UserSerializer body used on single-message endpoints.
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'id', 'room_id', 'sender_id', 'sender__username', 'content',
+            'timestamp', 'attachment', 'attachment_type', 'status', 'deleted_at'
+        )
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+
+        abs_prefix = request.build_absolute_uri('/').rstrip('/')
+        media_url = settings.MEDIA_URL
+        results = []
+        for row in rows:
+            attachment = row['attachment']
+            if attachment:
+                attachment_url = media_url + attachment
+                if not attachment_url.startswith(('http://', 'https://')):
+                    attachment_url = abs_prefix + attachment_url
+            else:
+                attachment_url = None
+            results.append({
+                'id': row['id'],
+                'room': row['room_id'],
+                'sender': {'id': row['sender_id'], 'username': row['sender__username']},
+                'content': row['content'],
+                'timestamp': row['timestamp'],
+                'attachment_url': attachment_url,
+                'attachment_type': row['attachment_type'],
+                'status': row['status'],
+                'is_deleted': False,  # queryset excludes deleted messages
+            })
+
+        if results:
+            # The old filter asked for messages both read and unread by
+            # the user, so it never matched; viewing the list now marks
+            # others' unread messages seen and records the read receipt
+            # with one UPDATE plus one bulk through-table INSERT
+            unread_ids = list(
+                Message.objects.filter(room_id=self.kwargs['room_id'])
+                .exclude(sender=self.request.user)
+                .exclude(read_by=self.request.user)
+                .values_list('id', flat=True)
+            )
+            if unread_ids:
+                Message.objects.filter(id__in=unread_ids).update(status='seen')
+                ReadBy = Message.read_by.through
+                ReadBy.objects.bulk_create(
+                    [ReadBy(message_id=mid, user_id=self.request.user.id)
+                     for mid in unread_ids],
+                    ignore_conflicts=True,
+                    batch_size=1000
+                )
+
+        if page is not None:
+            body = {
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
+                'results': results,
+            }
+        else:
+            body = results
+        response = HttpResponse(orjson.dumps(body), content_type='application/json')
+        response['ETag'] = etag
         return response
 
     @swagger_auto_schema(
@@ -196,11 +557,20 @@ class MessageDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_destroy(self, instance):
         instance.delete(soft_delete=True)
+        self._bump_room_version(instance.room_id)
 
     def perform_update(self, serializer):
         if serializer.instance.deleted_at:
             raise PermissionDenied("Cannot edit deleted messages")
         serializer.save()
+        self._bump_room_version(serializer.instance.room_id)
+
+    @staticmethod
+    def _bump_room_version(room_id):
+        # Edits and soft-deletes don't move any message timestamp, so
+        # the room's version is rolled instead — it feeds the message
+        # list ETag and the per-room payload cache keys
+        ChatRoom.objects.filter(pk=room_id).update(updated_at=Now())
 
 class MembershipViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
@@ -223,7 +593,24 @@ class MembershipViewSet(viewsets.ModelViewSet):
         return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        serializer.save(room_id=self.kwargs['room_id'])
+        # get_or_create keeps re-adds idempotent in one query pair; the
+        # uniq_membership constraint backs it up under races
+        membership, created = Membership.objects.get_or_create(
+            room_id=self.kwargs['room_id'],
+            user=serializer.validated_data['user'],
+            defaults={'role': serializer.validated_data.get('role', 'member')}
+        )
+        serializer.instance = membership
+        if created:
+            member_ids = list(
+                Membership.objects.filter(room_id=membership.room_id)
+                .values_list('user_id', flat=True)
+            )
+            invalidate_room_list_cache(member_ids)
+            if len(member_ids) == ChatConsumer.LARGE_ROOM_FANOUT_THRESHOLD + 1:
+                # This add pushed the room into pub/sub fan-out; tell
+                # live connections to switch transports
+                notify_fanout_mode_change(membership.room_id, True)
 
     def update(self, request, *args, **kwargs):
         room = get_object_or_404(ChatRoom.objects.filter(members=request.user), pk=self.kwargs['room_id'])
@@ -236,46 +623,68 @@ class MembershipViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['delete'])
     def remove_self(self, request, room_id):
         with transaction.atomic():
-            membership = get_object_or_404(
-                Membership.objects.select_for_update(),
-                room_id=room_id,
-                user=request.user
-            )
-
-            if membership.role == 'admin' and \
-               Membership.objects.filter(room_id=room_id, role='admin').count() <= 1:
-                membership.room.delete()
+            # One locked fetch of the room's memberships; role checks and
+            # the admin count come from the list instead of extra queries
+            memberships = _locked_room_memberships(room_id)
+            mine = next((m for m in memberships if m.user_id == request.user.id), None)
+            if mine is None:
+                return Response({"error": "You are not a member of this room"}, status=404)
+
+            admin_count = sum(1 for m in memberships if m.role == 'admin')
+            if mine.role == 'admin' and admin_count <= 1:
+                ChatRoom.objects.filter(id=room_id).delete()
+                self._invalidate_caches(memberships)
                 return Response({"detail": "Room deleted as you were the last admin"}, status=200)
 
-            membership.delete()
+            mine.delete()
+            self._invalidate_caches(memberships)
+            self._notify_if_shrunk_below_threshold(room_id, memberships)
             return Response({"detail": "Successfully left the room"}, status=200)
 
+    @staticmethod
+    def _notify_if_shrunk_below_threshold(room_id, memberships):
+        if len(memberships) - 1 == ChatConsumer.LARGE_ROOM_FANOUT_THRESHOLD:
+            # This removal dropped the room back into the channel-layer
+            # regime; move live connections off the pub/sub channel
+            notify_fanout_mode_change(room_id, False)
+
+    @staticmethod
+    def _invalidate_caches(memberships):
+        invalidate_room_list_cache([m.user_id for m in memberships])
+        if len(memberships) == 2:
+            # The dissolved pair may have been a direct chat; dropping
+            # the key is a harmless no-op for two-member group rooms
+            redis_client.delete(
+                _direct_chat_cache_key(memberships[0].user_id, memberships[1].user_id)
+            )
+
     @action(detail=True, methods=['delete'])
     def remove_member(self, request, room_id, pk=None):
         """Allow admin to remove a member from the chat room"""
         with transaction.atomic():
-            # Check if the requesting user is an admin
-            if not request.user.memberships.filter(room_id=room_id, role='admin').exists():
+            # Same pattern as remove_self: one locked fetch covers the
+            # admin check and the target lookup
+            memberships = _locked_room_memberships(room_id)
+            requester = next((m for m in memberships if m.user_id == request.user.id), None)
+            if requester is None or requester.role != 'admin':
                 return Response({"error": "Only admins can remove members"}, status=403)
-            
-            # Get the membership to remove
-            membership = get_object_or_404(
-                Membership.objects.select_for_update(),
-                room_id=room_id,
-                id=pk
-            )
-            
+
+            membership = next((m for m in memberships if m.id == int(pk)), None)
+            if membership is None:
+                return Response({"error": "Membership not found"}, status=404)
+
             # Prevent removing yourself through this endpoint
-            if membership.user == request.user:
+            if membership.user_id == request.user.id:
                 return Response({"error": "Use remove_self endpoint to leave the room"}, status=400)
-            
+
             # Prevent removing another admin
             if membership.role == 'admin':
                 return Response({"error": "Cannot remove another admin"}, status=403)
-            
-            # Remove the member
+
             membership.delete()
-            return Response({"detail": f"Successfully removed member from the room"}, status=200)
+            self._invalidate_caches(memberships)
+            self._notify_if_shrunk_below_threshold(room_id, memberships)
+            return Response({"detail": "Successfully removed member from the room"}, status=200)
 
 class UserSearchView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
@@ -332,9 +741,14 @@ class DirectChatView(generics.GenericAPIView):
         if user == request.user:
             return Response({"error": "Cannot chat with yourself"}, status=400)
 
-        existing_chat = ChatRoom.objects.filter(type='direct', members=request.user).filter(members=user).first()
+        existing_chat = _find_direct_chat(request.user, user)
         if existing_chat:
-            return Response(self.get_serializer(existing_chat).data, status=200)
+            return Response(
+                serialize_room_cached(
+                    existing_chat, request.user, self.get_serializer_context()
+                ),
+                status=200
+            )
 
         with transaction.atomic():
             chat = ChatRoom.objects.create(type='direct')
@@ -342,20 +756,38 @@ class DirectChatView(generics.GenericAPIView):
                 Membership(user=request.user, room=chat, role='admin'),
                 Membership(user=user, room=chat, role='admin')
             ])
+        redis_client.setex(
+            _direct_chat_cache_key(request.user.id, user.id),
+            DIRECT_CHAT_CACHE_TTL, str(chat.id)
+        )
+        invalidate_room_list_cache([request.user.id, user.id])
 
-        return Response(self.get_serializer(chat).data, status=201)
+        return Response(
+            serialize_room_cached(
+                chat, request.user, self.get_serializer_context()
+            ),
+            status=201
+        )
 
 
 class MarkMessagesReadView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, room_id):
-        messages = Message.objects.filter(
-            room_id=room_id
-        ).exclude(sender=request.user).exclude(read_by=request.user)
-
-        count = messages.count()
-        for message in messages:
-            message.read_by.add(request.user)
-
-        return Response({'status': 'success', 'messages_marked_read': count})
+        message_ids = list(
+            Message.objects.filter(room_id=room_id)
+            .exclude(sender=request.user)
+            .exclude(read_by=request.user)
+            .values_list('id', flat=True)
+        )
+
+        # One INSERT on the M2M through table instead of a SELECT+INSERT
+        # per message via read_by.add
+        ReadBy = Message.read_by.through
+        ReadBy.objects.bulk_create(
+            [ReadBy(message_id=mid, user_id=request.user.id) for mid in message_ids],
+            ignore_conflicts=True,
+            batch_size=1000
+        )
+
+        return Response({'status': 'success', 'messages_marked_read': len(message_ids)})
@@ -157,6 +157,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
+# W040 warns that sqlite ignores covering-index INCLUDE columns; that's
+# expected — the covering part only matters on the Postgres deployment
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -206,6 +210,7 @@ REDIS_CONFIG = {
     'port': int(os.getenv('REDIS_PORT', 6379)),
     'db': int(os.getenv('REDIS_DB', 0)),
 }
+REDIS_POOL_SIZE = int(os.getenv('REDIS_POOL_SIZE', 50))
 
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = False  # Set to True only in development
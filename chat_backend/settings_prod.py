@@ -23,7 +23,14 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
-        'CONN_MAX_AGE': 60,
+        # Recycling connections every minute re-paid the Postgres
+        # handshake on the login/OTP hot path; keep them for 10 minutes
+        # and let health checks weed out dead ones
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'application_name': 'chat_backend',
+        },
     }
 }
 
@@ -49,7 +56,6 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
-CORS_ALLOW_ALL_ORIGINS = True  # Only use in development
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -75,15 +81,14 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static')
 ]
 
-# Ensure Django serves static files even in production
-DEBUG = True  # Temporarily set to True to debug static files
-
-# Add whitenoise for static files serving
+# Add whitenoise for static files serving. With the brotli extra
+# installed, collectstatic pre-compresses .br alongside .gz
 MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ] + MIDDLEWARE
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+WHITENOISE_USE_FINDERS = False
 
 # Media files configuration
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -117,9 +122,17 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': True,
         },
+        'users': {
+            'handlers': ['file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
+# Email: bound how long a stuck SMTP connection can hold a worker
+EMAIL_TIMEOUT = 10
+
 # Cache Configuration
 CACHES = {
     'default': {
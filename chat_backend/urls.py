@@ -41,10 +41,36 @@ urlpatterns = [
     path('api/v1/users/', include('users.urls')),
     path('api/v1/chat/', include('chat.urls')),
     
-    # Swagger URLs
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Swagger URLs. The generated spec is cached for an hour — schema
+    # introspection walks every pattern and serializer, so regenerating
+    # per hit is wasteful. Bump the key prefix when the API changes
+    # shape between deploys.
+    path(
+        'swagger<format>/',
+        schema_view.without_ui(
+            cache_timeout=60 * 60,
+            cache_kwargs={'key_prefix': 'swagger_schema_v1'},
+        ),
+        name='schema-json',
+    ),
+    path(
+        '',
+        schema_view.with_ui(
+            'swagger',
+            cache_timeout=60 * 60,
+            cache_kwargs={'key_prefix': 'swagger_schema_v1'},
+        ),
+        name='schema-swagger-ui',
+    ),
+    path(
+        'redoc/',
+        schema_view.with_ui(
+            'redoc',
+            cache_timeout=60 * 60,
+            cache_kwargs={'key_prefix': 'swagger_schema_v1'},
+        ),
+        name='schema-redoc',
+    ),
 ]
 
 # Add media URL patterns in development
@@ -0,0 +1,16 @@
+from uvicorn.workers import UvicornWorker
+
+
+class ChatUvicornWorker(UvicornWorker):
+    """
+    UvicornWorker pinned to uvloop + httptools.
+
+    The default worker falls back to asyncio/h11 when auto-detection
+    fails; the chat fan-out is syscall-bound, so the faster loop and
+    HTTP parser are pinned explicitly here.
+    """
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        'loop': 'uvloop',
+        'http': 'httptools',
+    }
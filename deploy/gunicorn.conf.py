@@ -1,9 +1,17 @@
 import multiprocessing
 
 bind = "0.0.0.0:8001"  # Changed from 8000 to 8001
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "uvicorn.workers.UvicornWorker"
-max_requests = 1000
-max_requests_jitter = 50
+# cpu_count()*2+1 is the sync-worker formula; each async worker already
+# multiplexes thousands of connections, so oversubscribing cores just
+# adds context switches
+workers = multiprocessing.cpu_count()
+# Pinned to uvloop + httptools instead of uvicorn's auto-detection
+worker_class = "chat_backend.workers.ChatUvicornWorker"
+worker_connections = 2000
+# Import Django once in the master; workers fork with the app loaded
+preload_app = True
+max_requests = 10000
+max_requests_jitter = 500
 timeout = 120
+graceful_timeout = 30
 keepalive = 5
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.2 on 2026-08-31 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='user',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], include=('is_active', 'password'), name='user_email_login_idx'),
+        ),
+    ]
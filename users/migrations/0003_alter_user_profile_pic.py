@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-08-31 14:19
+
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_options_user_user_email_login_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_pic',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pics/', validators=[users.models.validate_profile_pic]),
+        ),
+    ]
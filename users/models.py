@@ -1,10 +1,30 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+PROFILE_PIC_MAX_BYTES = 5 * 1024 * 1024
+_IMAGE_MAGIC = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF8')
+
+def validate_profile_pic(value):
+    """
+    Single-pass upload check: size first, then the first few magic
+    bytes. Oversized or non-image uploads are rejected before Pillow
+    ever reads the full file.
+    """
+    if value.size > PROFILE_PIC_MAX_BYTES:
+        raise ValidationError("Profile picture may not exceed 5MB.")
+    head = value.read(8)
+    value.seek(0)
+    if not head.startswith(_IMAGE_MAGIC):
+        raise ValidationError("Profile picture must be a JPEG, PNG or GIF image.")
+
 class User(AbstractUser):
     email = models.EmailField(unique=True)
-    profile_pic = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
+    profile_pic = models.ImageField(
+        upload_to='profile_pics/', null=True, blank=True,
+        validators=[validate_profile_pic],
+    )
     status = models.CharField(
         max_length=10,
         choices=[('online', 'Online'), ('offline', 'Offline')],
@@ -13,5 +33,18 @@ class User(AbstractUser):
     last_seen = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Login reads only these columns; on Postgres the INCLUDE
+            # lets the lookup resolve as an index-only scan instead of
+            # touching the (wide, profile_pic-bearing) heap row. Other
+            # backends skip the index — email already has a unique one.
+            models.Index(
+                fields=['email'],
+                include=['is_active', 'password'],
+                name='user_email_login_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.username
\ No newline at end of file
@@ -24,24 +24,26 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             # First try to get the user by email
             try:
                 user = User.objects.get(email=email)
-                
+
+                # is_active before check_password: skips the hash work
+                # for inactive accounts, and the opaque message avoids
+                # confirming the account exists
+                if not user.is_active:
+                    raise serializers.ValidationError({
+                        'detail': ERROR_MESSAGES['INVALID_CREDENTIALS']
+                    })
+
                 # Check if password is correct
                 if not user.check_password(password):
                     raise serializers.ValidationError({
                         'detail': ERROR_MESSAGES['INVALID_CREDENTIALS']
                     })
-                
+
             except User.DoesNotExist:
                 raise serializers.ValidationError({
                     'detail': ERROR_MESSAGES['INVALID_CREDENTIALS']
                 })
-            
-            # Check if user is active
-            if not user.is_active:
-                raise serializers.ValidationError({
-                    'detail': ERROR_MESSAGES['ACCOUNT_INACTIVE']
-                })
-            
+
             # If all checks pass, proceed with token generation
             try:
                 # Set the user in the serializer instance
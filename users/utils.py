@@ -1,16 +1,15 @@
-import redis
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.mail import send_mail
 from django.conf import settings
+from chat.redis_pool import redis_client
 from .constants import (
-    REDIS_HOST, REDIS_PORT, REDIS_DB,
     OTP_EXPIRY_TIME,
     EMAIL_SUBJECT, EMAIL_MESSAGE_TEMPLATE,
     ERROR_MESSAGES
 )
 
-# Initialize Redis connection
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
-
 def set_user_online(user_id):
     redis_client.set(f'user:{user_id}:online', 'true', ex=300)  # 5 minute timeout
 
@@ -20,20 +19,49 @@ def set_user_offline(user_id):
 def is_user_online(user_id):
     return redis_client.exists(f'user:{user_id}:online') == 1
 
-def send_otp_email(email, otp):
-    """Send OTP via email."""
+logger = logging.getLogger(__name__)
+
+# SMTP round-trips take 100ms-2s; a small worker pool keeps them off
+# the request thread
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='otp-email')
+
+def _send_otp_email_blocking(email, otp):
     message = EMAIL_MESSAGE_TEMPLATE.format(otp=otp)
-    return send_mail(
-        EMAIL_SUBJECT,
-        message,
-        settings.EMAIL_HOST_USER,
-        [email],
-        fail_silently=False,
-    )
+    try:
+        send_mail(
+            EMAIL_SUBJECT,
+            message,
+            settings.EMAIL_HOST_USER,
+            [email],
+            fail_silently=False,
+        )
+    except Exception:
+        logger.exception("Failed to send OTP email to %s", email)
+
+def send_otp_email(email, otp):
+    """Queue the OTP email; the SMTP round-trip happens off-thread."""
+    return _email_executor.submit(_send_otp_email_blocking, email, otp)
+
+# At most this many OTP sends per email per window
+OTP_RATE_LIMIT = 5
+OTP_RATE_WINDOW = 3600
 
 def store_otp(email, otp):
-    """Store OTP in Redis with expiry."""
-    redis_client.setex(f"otp:{email}", OTP_EXPIRY_TIME, otp)
+    """
+    Store OTP in Redis, subject to the per-email send counter.
+
+    The counter is bumped and checked first; over the limit the stored
+    OTP is left untouched, so the code the user last received keeps
+    verifying while their requests are throttled. Returns the number of
+    sends in the current window so callers can rate-limit.
+    """
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.incr(f"otp:rate:{email}")
+        pipe.expire(f"otp:rate:{email}", OTP_RATE_WINDOW)
+        count, _ = pipe.execute()
+    if count <= OTP_RATE_LIMIT:
+        redis_client.setex(f"otp:{email}", OTP_EXPIRY_TIME, otp)
+    return count
 
 def get_stored_otp(email):
     """Get stored OTP from Redis."""
@@ -15,8 +15,9 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-import random
-import redis
+import secrets
+
+from cachetools import TTLCache
 
 from .models import User
 from .serializers import (
@@ -31,6 +32,7 @@ from .serializers import (
     ChangePasswordSerializer
 )
 from .utils import (
+    OTP_RATE_LIMIT,
     send_otp_email,
     store_otp,
     verify_otp,
@@ -38,17 +40,25 @@ from .utils import (
 )
 from .constants import ERROR_MESSAGES
 
-# Initialize Redis connection
-redis_client = redis.Redis(host='localhost', port=6379, db=0)
-OTP_EXPIRY_TIME = 300  # 5 minutes in seconds
+# Short-lived login lookup cache: mobile clients retry login in tight
+# loops, and 5s of staleness for is_active/password is acceptable
+# because password changes evict explicitly below
+_login_user_cache = TTLCache(maxsize=1000, ttl=5)
 
 # Helper function to generate and send OTP
 
 def generate_and_send_otp(email):
-    """Generate a 6-digit OTP and send it via email."""
-    otp = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-    store_otp(email, otp)
+    """
+    Generate a 6-digit OTP and send it via email.
+
+    Returns False without sending when the email has exceeded its
+    hourly OTP quota.
+    """
+    otp = f"{secrets.randbelow(1_000_000):06d}"
+    if store_otp(email, otp) > OTP_RATE_LIMIT:
+        return False
     send_otp_email(email, otp)
+    return True
 
 @swagger_auto_schema(
     method='post',
@@ -73,7 +83,10 @@ def request_otp(request):
     serializer = OTPRequestSerializer(data=request.data)
     if serializer.is_valid():
         email = serializer.validated_data['email']
-        generate_and_send_otp(email)
+        if not generate_and_send_otp(email):
+            return Response({
+                'error': 'Too many OTP requests. Please try again later.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         return Response({
             'message': 'OTP sent successfully to your email',
             'email': email
@@ -150,15 +163,23 @@ class LoginView(generics.GenericAPIView):
             password = serializer.validated_data['password']
             
             try:
-                user = User.objects.get(email=email)
-                if not user.check_password(password):
+                user = _login_user_cache.get(email)
+                if user is None:
+                    user = User.objects.only(
+                        'id', 'username', 'email', 'password', 'is_active'
+                    ).get(email=email)
+                    _login_user_cache[email] = user
+                # is_active first: inactive accounts shouldn't pay (or
+                # make us pay) the password-hash cost, and the opaque
+                # message avoids confirming the account exists
+                if not user.is_active:
                     return Response({
                         'detail': ERROR_MESSAGES['INVALID_CREDENTIALS']
                     }, status=status.HTTP_401_UNAUTHORIZED)
-                
-                if not user.is_active:
+
+                if not user.check_password(password):
                     return Response({
-                        'detail': ERROR_MESSAGES['ACCOUNT_INACTIVE']
+                        'detail': ERROR_MESSAGES['INVALID_CREDENTIALS']
                     }, status=status.HTTP_401_UNAUTHORIZED)
                 
                 # Generate tokens
@@ -227,7 +248,10 @@ def forgot_password_request(request):
     serializer = ForgotPasswordRequestSerializer(data=request.data)
     if serializer.is_valid():
         email = serializer.validated_data['email']
-        generate_and_send_otp(email)
+        if not generate_and_send_otp(email):
+            return Response({
+                'error': 'Too many OTP requests. Please try again later.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         return Response({
             'message': 'Password reset OTP sent successfully to your email',
             'email': email
@@ -271,7 +295,8 @@ def reset_password(request):
             user = User.objects.get(email=email)
             user.set_password(serializer.validated_data['new_password'])
             user.save()
-            
+            _login_user_cache.pop(email, None)
+
             # Delete used OTP
             delete_otp(email)
             
@@ -310,6 +335,7 @@ def change_password(request):
     serializer = ChangePasswordSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         serializer.save()
+        _login_user_cache.pop(request.user.email, None)
         return Response({
             'message': 'Password changed successfully'
         }, status=status.HTTP_200_OK)